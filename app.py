@@ -1,16 +1,25 @@
 from typing import List, Tuple
-from openai import OpenAI
+from openai import (
+    APIError,
+    BadRequestError,
+    OpenAI,
+    UnprocessableEntityError,
+)
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from core.checkpoint import Checkpoint
 from core.cloner import RepoCloner
 from core.docgen import DocGenerator, LLMConfig
 from core.embedder import Embedder
 from core.indexer.faiss_indexer import FaissIndexer
+from core.indexer.lexical_indexer import LexicalIndexer
 from core.parser import Parser
+from core.scheduler import Budget, Scheduler
 from core.treesitter_extractor import TreeSitterExtractor
 from core.types import Chunk
+from core.writer import MarkdownWriter
 
 
 load_dotenv()
@@ -46,15 +55,38 @@ embedder = Embedder()
 vectors = embedder.embed_texts([func.code for func in chunks])
 print(vectors.shape)
 
-indexer = FaissIndexer(vectors.shape[1])
+lexical = LexicalIndexer()
+lexical.add(chunks)
+
+indexer = FaissIndexer(
+    vectors.shape[1],
+    lexical=lexical,
+    alpha=float(os.getenv("DOCGEN_HYBRID_ALPHA", "0.5")),
+)
+indexer.add(vectors, [chunk.id for chunk in chunks])
+
+# reuse the vectors computed above instead of re-embedding each query chunk
+id2vec = {chunk.id: vec for chunk, vec in zip(chunks, vectors)}
+
 
+def get_similar_chunks(chunk: Chunk, indexer: FaissIndexer, id2chunk, id2vec, k=5):
+    # callees and type definitions come from exact symbol lookups (score 1.0);
+    # hybrid results share the same 0-1 similarity scale
+    results = indexer.lexical.related_definitions(chunk.id, k)
+    seen = {chunk.id} | {result["id"] for result in results}
 
-def get_similar_chunks(
-    query: str, embedder: Embedder, indexer: FaissIndexer, id2chunk, k=5
-):
-    vec = embedder.embed_texts([query])[0]
-    results = indexer.search(vec, k)
-    return [(id2chunk[result["id"]], result["score"]) for result in results]
+    if len(results) < k:
+        hybrid = indexer.search(
+            id2vec.get(chunk.id),
+            k + len(seen),
+            query_terms=indexer.lexical.terms_for(chunk.id),
+        )
+        for result in hybrid:
+            if result["id"] not in seen:
+                seen.add(result["id"])
+                results.append(result)
+
+    return [(id2chunk[result["id"]], result["score"]) for result in results[:k]]
 
 
 cfg = LLMConfig(model="gpt-3.5-turbo", temperature=0.0, max_tokens=500)
@@ -62,17 +94,55 @@ cfg = LLMConfig(model="gpt-3.5-turbo", temperature=0.0, max_tokens=500)
 dg = DocGenerator(llm_client=client, config=cfg)
 
 
-def write_markdown(chunk, md, output_dir="./documentations"):
-    root = Path(output_dir)
-    file_path = Path(chunk.file)
-    out_file = root / file_path.name.replace(".py", ".md")
-    out_file.parent.mkdir(parents=True, exist_ok=True)
+def _env_number(name, cast=int):
+    value = os.getenv(name)
+    return cast(value) if value else None
+
+
+checkpoint = Checkpoint("./documentations/.progress.jsonl")
+print(f"resuming with {len(checkpoint)} chunks already documented")
 
-    name = f"{chunk.name or'chunk_'}_{chunk.start}_{chunk.end}.md"
-    (out_file.parent / name).write_text(md)
+priority = os.getenv("DOCGEN_PRIORITY", "public_api,most_referenced,recently_changed")
+scheduler = Scheduler(policies=[p.strip() for p in priority.split(",") if p.strip()])
+
+budget = Budget(
+    max_chunks=_env_number("DOCGEN_MAX_CHUNKS"),
+    max_tokens=_env_number("DOCGEN_MAX_TOKENS"),
+    max_seconds=_env_number("DOCGEN_MAX_SECONDS", float),
+)
 
 
-for chunk in chunks:
-    related_chunks = get_similar_chunks(chunk.code, embedder, indexer, id2chunk)
-    md = dg.generate_function_md(chunk, related_chunks)
-    write_markdown(chunk, md)
+writer = MarkdownWriter("./documentations")
+writer.expect(chunks)
+
+try:
+    for chunk in scheduler.order(chunks):
+        md = checkpoint.get_md(chunk) if checkpoint.is_done(chunk) else None
+        if md is not None:
+            writer.add(chunk, md)
+            continue
+
+        reason = budget.exhausted()
+        if reason:
+            print(f"Stopping: {reason}. Re-run to resume.")
+            break
+
+        related_chunks = get_similar_chunks(chunk, indexer, id2chunk, id2vec)
+        try:
+            md = dg.generate_function_md(chunk, related_chunks)
+        except (BadRequestError, UnprocessableEntityError) as e:
+            # per-chunk failures (context length, content policy, ...) must not
+            # block every resumed run at the same chunk
+            print(f"Skipping {chunk.file}:{chunk.start} after API error: {e}")
+            continue
+        except APIError as e:
+            # quota / rate limits, bad or revoked keys, 5xx and connection
+            # outages hit every chunk alike: stop, progress is already on disk
+            print(f"Stopping on API error for {chunk.file}:{chunk.start}: {e}")
+            break
+        checkpoint.mark_done(chunk, md, tokens=dg.last_tokens)
+        budget.charge(dg.last_tokens)
+        writer.add(chunk, md)
+finally:
+    writer.flush()
+    print(f"wrote {writer.written} docs, {writer.skipped} unchanged")
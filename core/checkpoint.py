@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from core.types import Chunk
+
+
+class Checkpoint:
+    """
+    Durable per-chunk progress for a docgen run.
+
+    Progress is an append-only JSONL file: one record per finished chunk, flushed
+    and fsync'd before the next chunk starts, so an interrupted run resumes exactly
+    where it stopped. Records are keyed by file, symbol name and code hash rather
+    than chunk id (which includes line numbers), so chunks that merely moved are
+    not redone, while a chunk whose code changed is.
+    """
+
+    def __init__(self, path: str = "./documentations/.progress.jsonl"):
+        self.path = Path(path)
+        self.done: Dict[str, dict] = {}
+        self._load()
+
+    @staticmethod
+    def _key(chunk: Chunk) -> str:
+        rel_path = Path(os.path.relpath(chunk.file, chunk.repo)).as_posix()
+        code_hash = hashlib.sha1(chunk.code.encode("utf-8")).hexdigest()[:16]
+        return f"{rel_path}::{chunk.name or ''}::{code_hash}"
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # a crash mid-write can leave a truncated last line
+                    continue
+                # records from before keying by code hash are simply redone
+                if "key" in record:
+                    self.done[record["key"]] = record
+
+    def is_done(self, chunk: Chunk) -> bool:
+        return self._key(chunk) in self.done
+
+    def get_md(self, chunk: Chunk) -> Optional[str]:
+        record = self.done.get(self._key(chunk))
+        return record.get("md") if record else None
+
+    def mark_done(self, chunk: Chunk, md: str, tokens: int = 0):
+        # the doc itself is kept here so per-file outputs can be rebuilt on resume
+        key = self._key(chunk)
+        record = {
+            "key": key,
+            "id": chunk.id,
+            "file": chunk.file,
+            "md": md,
+            "tokens": tokens,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.done[key] = record
+
+    def __len__(self):
+        return len(self.done)
@@ -19,6 +19,13 @@ class DocGenerator:
     def __init__(self, llm_client: OpenAI, config: LLMConfig = None):
         self.client = llm_client
         self.config = config
+        # tokens spent by the most recent generate_function_md call
+        self.last_tokens = 0
+
+    @staticmethod
+    def _usage_tokens(response) -> int:
+        usage = getattr(response, "usage", None)
+        return getattr(usage, "total_tokens", 0) or 0
 
     def _build_context_text(
         self, related_chunks: List[Tuple[Chunk, float]], max_chars=3000
@@ -100,6 +107,8 @@ class DocGenerator:
             max_tokens=self.config.max_tokens,
         )
 
+        self.last_tokens = self._usage_tokens(response)
+
         raw_md = response.choices[0].message.content.strip()
         md = strip_triple_backticks(raw_md)
 
@@ -127,6 +136,7 @@ class DocGenerator:
                 temperature=0.0,
                 max_tokens=150,
             )
+            self.last_tokens += self._usage_tokens(val_resp)
             raw_val = val_resp.choices[0].message.content.strip()
             val_text = strip_triple_backticks(raw_val)
             # if validation flagged issues, append a short note at the bottom of md
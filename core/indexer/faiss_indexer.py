@@ -3,13 +3,24 @@ from pathlib import Path
 import faiss
 import numpy as np
 
+from core.indexer.lexical_indexer import LexicalIndexer
+
 
 class FaissIndexer:
-    def __init__(self, dim: int, index_path: str = None):
+    def __init__(
+        self,
+        dim: int,
+        index_path: str = None,
+        lexical: LexicalIndexer = None,
+        alpha: float = 0.5,
+    ):
         self.dim = dim
         self.index = faiss.IndexHNSWFlat(dim, 32)
         self.id_map = []
         self.index_path = index_path
+        # optional BM25 index fused into search; alpha is the dense weight
+        self.lexical = lexical
+        self.alpha = alpha
 
     def add(self, vectors: np.ndarray, ids: list):
         self.index.add(
@@ -17,7 +28,7 @@ class FaissIndexer:
         )
         self.id_map.extend(ids)
 
-    def search(self, vector: np.ndarray, k: int = 5):
+    def _dense_search(self, vector: np.ndarray, k: int):
         if vector.ndim == 1:
             vector = vector.reshape(1, -1)
 
@@ -29,13 +40,60 @@ class FaissIndexer:
             results.append({"id": self.id_map[idx], "score": float(dist)})
         return results
 
+    @staticmethod
+    def _similarity(distance: float) -> float:
+        # L2 distance -> similarity in (0, 1], higher is better
+        return 1.0 / (1.0 + distance)
+
+    def search(self, vector: np.ndarray, k: int = 5, query_terms: list = None):
+        """
+        `score` is always a similarity in [0, 1], higher is better. Without a
+        lexical index (or query terms) it is `1 / (1 + L2 distance)`. Otherwise
+        it is `alpha * dense + (1 - alpha) * bm25`, with BM25 scaled by the best
+        candidate's score. `vector` may be None for a lexical-only search.
+        """
+        if self.lexical is None or not query_terms:
+            return [
+                {"id": r["id"], "score": self._similarity(r["score"])}
+                for r in self._dense_search(vector, k)
+            ]
+
+        pool = k * 4
+        dense = {}
+        if vector is not None and self.alpha > 0:
+            dense = {
+                r["id"]: self._similarity(r["score"])
+                for r in self._dense_search(vector, pool)
+            }
+        sparse = {}
+        if self.alpha < 1:
+            sparse = {
+                r["id"]: r["score"] for r in self.lexical.search(query_terms, pool)
+            }
+
+        if sparse:
+            top_bm25 = max(sparse.values()) or 1.0
+            sparse = {key: value / top_bm25 for key, value in sparse.items()}
+        fused = {
+            chunk_id: self.alpha * dense.get(chunk_id, 0.0)
+            + (1 - self.alpha) * sparse.get(chunk_id, 0.0)
+            for chunk_id in set(dense) | set(sparse)
+        }
+        top = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [{"id": chunk_id, "score": score} for chunk_id, score in top]
+
     def save(self, out_dir: str):
         p = Path(out_dir)
         p.mkdir(parents=True, exist_ok=True)
         faiss.write_index(self.index, str(p / "index.faiss"))
         (p / "id_map.json").write_text(json.dumps(self.id_map))
+        if self.lexical is not None:
+            self.lexical.save(out_dir)
 
     def load(self, in_dir: str):
         p = Path(in_dir)
         self.index = faiss.read_index(str(p / "index.faiss"))
         self.id_map = json.loads((p / "id_map.json").read_text())
+        if (p / "lexical.json").exists():
+            self.lexical = self.lexical or LexicalIndexer()
+            self.lexical.load(in_dir)
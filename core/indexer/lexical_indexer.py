@@ -0,0 +1,182 @@
+from collections import Counter, defaultdict
+import json
+import math
+from pathlib import Path
+import re
+from typing import Dict, List
+
+from core.types import Chunk
+from core.utils import IDENT_RE
+
+
+SUBWORD_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+# definitions of these kinds are treated as type definitions
+TYPE_KINDS = {"class_definition", "class_declaration"}
+
+
+def tokenize(identifiers: List[str]) -> List[str]:
+    """Lowercased identifiers plus their snake_case / camelCase parts."""
+    terms = []
+    for ident in identifiers:
+        terms.append(ident.lower())
+        parts = SUBWORD_RE.findall(ident)
+        if len(parts) > 1:
+            terms.extend(part.lower() for part in parts)
+    return terms
+
+
+class LexicalIndexer:
+    """
+    Identifier-level inverted index over chunks. Supports BM25 ranking and
+    exact symbol lookup, so callees and type definitions can be found without
+    an embedding query.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.5,
+        b: float = 0.75,
+        max_query_terms: int = 16,
+        max_df_ratio: float = 0.2,
+    ):
+        self.k1 = k1
+        self.b = b
+        # queries keep only their rarest shared terms, and terms found in more
+        # than max_df_ratio of all chunks (self, return, ...) are ignored, so each
+        # search only walks a few short posting lists
+        self.max_query_terms = max_query_terms
+        self.max_df_ratio = max_df_ratio
+        self.id_map = []
+        self.postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self.doc_len = []
+        self.definitions: Dict[str, List[str]] = defaultdict(list)
+        self.docs = {}
+
+    @staticmethod
+    def _symbols(chunk: Chunk) -> dict:
+        meta = chunk.meta or {}
+        identifiers = meta.get("identifiers")
+        if identifiers is None:
+            # chunks from core.parser carry no tree-sitter tokens
+            identifiers = IDENT_RE.findall(chunk.code)
+        return {
+            "file": chunk.file,
+            "name": chunk.name,
+            "kind": meta.get("kind"),
+            "identifiers": identifiers,
+            "calls": meta.get("calls", []),
+            "member_calls": meta.get("member_calls", []),
+        }
+
+    def _add_doc(self, chunk_id: str, doc: dict):
+        idx = len(self.id_map)
+        self.id_map.append(chunk_id)
+        self.docs[chunk_id] = doc
+
+        terms = Counter(tokenize(doc["identifiers"]))
+        for term, tf in terms.items():
+            self.postings[term][idx] = tf
+        self.doc_len.append(sum(terms.values()))
+
+        if doc["name"] and doc["name"] != "<anon>":
+            self.definitions[doc["name"]].append(chunk_id)
+
+    def add(self, chunks: List[Chunk]):
+        for chunk in chunks:
+            self._add_doc(chunk.id, self._symbols(chunk))
+
+    def terms_for(self, chunk_id: str) -> List[str]:
+        doc = self.docs.get(chunk_id)
+        return tokenize(doc["identifiers"]) if doc else []
+
+    def lookup(self, name: str) -> List[str]:
+        """Exact symbol lookup: ids of chunks defining `name`."""
+        return list(self.definitions.get(name, []))
+
+    def search(self, query_terms: List[str], k: int = 5):
+        n_docs = len(self.id_map)
+        if not n_docs:
+            return []
+        avg_len = sum(self.doc_len) / n_docs or 1.0
+
+        # queries come from a chunk's own terms, so a df=1 term only matches
+        # the query chunk itself and would crowd out terms that link chunks
+        max_df = max(2, int(n_docs * self.max_df_ratio))
+        query_tf = Counter(query_terms)
+        dfs = {}
+        for term in query_tf:
+            postings = self.postings.get(term)
+            if postings and 1 < len(postings) <= max_df:
+                dfs[term] = len(postings)
+        # among equally rare terms, prefer the ones the query uses most
+        rarest = sorted(dfs, key=lambda term: (dfs[term], -query_tf[term], term))
+        rarest = rarest[: self.max_query_terms]
+
+        scores = defaultdict(float)
+        for term in rarest:
+            df = dfs[term]
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for idx, tf in self.postings[term].items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[idx] / avg_len)
+                scores[idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [{"id": self.id_map[idx], "score": score} for idx, score in top]
+
+    def related_definitions(self, chunk_id: str, k: int = 5, per_name: int = 2):
+        """
+        Definitions of the functions `chunk_id` calls, then of the types it
+        references, then of methods it calls on objects (`obj.foo()`). Same-file
+        definitions are preferred for ambiguous names; method calls only match
+        definitions in the caller's file, since `x.get()` or `p.then()` would
+        otherwise hit any same-named function in the repo.
+        """
+        doc = self.docs.get(chunk_id)
+        if not doc:
+            return []
+
+        type_refs = [
+            name
+            for name in dict.fromkeys(doc["identifiers"])
+            if any(self.docs[i]["kind"] in TYPE_KINDS for i in self.lookup(name))
+        ]
+        wanted = [(name, False) for name in list(doc["calls"]) + type_refs]
+        wanted += [(name, True) for name in doc.get("member_calls", [])]
+
+        results = []
+        seen = {chunk_id}
+        for name, same_file_only in wanted:
+            ids = [i for i in self.lookup(name) if i not in seen]
+            if same_file_only:
+                ids = [i for i in ids if self.docs[i]["file"] == doc["file"]]
+            ids.sort(key=lambda i: self.docs[i]["file"] != doc["file"])
+            for i in ids[:per_name]:
+                seen.add(i)
+                results.append({"id": i, "score": 1.0})
+            if len(results) >= k:
+                break
+        return results[:k]
+
+    def save(self, out_dir: str):
+        p = Path(out_dir)
+        p.mkdir(parents=True, exist_ok=True)
+        data = {
+            "k1": self.k1,
+            "b": self.b,
+            "max_query_terms": self.max_query_terms,
+            "max_df_ratio": self.max_df_ratio,
+            "docs": [[chunk_id, self.docs[chunk_id]] for chunk_id in self.id_map],
+        }
+        (p / "lexical.json").write_text(json.dumps(data))
+
+    def load(self, in_dir: str):
+        data = json.loads((Path(in_dir) / "lexical.json").read_text())
+        self.__init__(
+            k1=data["k1"],
+            b=data["b"],
+            max_query_terms=data.get("max_query_terms", self.max_query_terms),
+            max_df_ratio=data.get("max_df_ratio", self.max_df_ratio),
+        )
+        for chunk_id, doc in data["docs"]:
+            self._add_doc(chunk_id, doc)
@@ -0,0 +1,172 @@
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from git import GitCommandError, InvalidGitRepositoryError, NoSuchPathError, Repo
+
+from core.types import Chunk
+from core.utils import IDENT_RE
+
+
+DEFAULT_POLICIES = ("public_api", "most_referenced", "recently_changed")
+
+
+@dataclass
+class Budget:
+    """Limits for a single run. `None` means unlimited."""
+
+    max_chunks: Optional[int] = None
+    max_tokens: Optional[int] = None
+    max_seconds: Optional[float] = None
+
+    def __post_init__(self):
+        self.chunks_used = 0
+        self.tokens_used = 0
+        self.started_at = time.monotonic()
+
+    def charge(self, tokens: int = 0):
+        self.chunks_used += 1
+        self.tokens_used += tokens
+
+    def exhausted(self) -> Optional[str]:
+        """Return the reason the budget is spent, or None if work may continue."""
+        if self.max_chunks is not None and self.chunks_used >= self.max_chunks:
+            return f"chunk budget reached ({self.chunks_used}/{self.max_chunks})"
+        if self.max_tokens is not None and self.tokens_used >= self.max_tokens:
+            return f"token budget reached ({self.tokens_used}/{self.max_tokens})"
+        elapsed = time.monotonic() - self.started_at
+        if self.max_seconds is not None and elapsed >= self.max_seconds:
+            return f"time budget reached ({elapsed:.0f}s/{self.max_seconds:.0f}s)"
+        return None
+
+
+class Scheduler:
+    """
+    Orders chunks by a list of policies, most important first. Available policies:
+      - "public_api": exported (JS/TS) or non-underscore (Python) symbols first
+      - "most_referenced": symbols whose name appears most often across the repo
+      - "recently_changed": files with the newest commit (or mtime) first
+    """
+
+    def __init__(self, policies=DEFAULT_POLICIES):
+        unknown = set(policies) - set(DEFAULT_POLICIES)
+        if unknown:
+            raise ValueError(f"Unknown scheduling policies: {sorted(unknown)}")
+        self.policies = list(policies)
+
+    @staticmethod
+    def _is_public(chunk: Chunk) -> bool:
+        name = chunk.name or ""
+        if not name or name == "<anon>":
+            return False
+        # JS/TS: public means exported, recorded by TreeSitterExtractor
+        exported = (chunk.meta or {}).get("exported")
+        if exported is not None:
+            return exported
+        if name.startswith("_"):
+            return False
+        rel = os.path.relpath(chunk.file, chunk.repo)
+        return not any(part.startswith("_") for part in Path(rel).parts[:-1])
+
+    @staticmethod
+    def _reference_counts(chunks: List[Chunk]) -> Counter:
+        by_file = defaultdict(list)
+        for chunk in chunks:
+            by_file[chunk.file].append(chunk)
+
+        counts = Counter()
+        for file_chunks in by_file.values():
+            # chunks nest (a class contains its methods); count only outermost
+            # spans so each line of source is counted once
+            outer_end = 0
+            for chunk in sorted(file_chunks, key=lambda c: (c.start, -c.end)):
+                if chunk.end <= outer_end:
+                    continue
+                outer_end = chunk.end
+                counts.update(IDENT_RE.findall(chunk.code))
+
+        # every definition mentions its own name exactly once in that source
+        for chunk in chunks:
+            if chunk.name in counts:
+                counts[chunk.name] -= 1
+        return counts
+
+    @staticmethod
+    def _file_change_times(chunks: List[Chunk]) -> Dict[str, float]:
+        times = {}
+        files = {chunk.file for chunk in chunks}
+        repos = {chunk.repo for chunk in chunks}
+        for repo_root in repos:
+            wanted = {
+                os.path.abspath(chunk.file)
+                for chunk in chunks
+                if chunk.repo == repo_root
+            }
+            try:
+                repo = Repo(repo_root, search_parent_directories=True)
+                # newest commit first, so the first timestamp seen per file wins;
+                # stream and stop once every wanted file has one. quotePath=off
+                # keeps non-ASCII paths unescaped so they match.
+                process = repo.git(c="core.quotePath=off").log(
+                    "--name-only",
+                    "--format=%x00%ct",
+                    "--",
+                    os.path.relpath(os.path.abspath(repo_root), repo.working_tree_dir),
+                    as_process=True,
+                )
+            except (InvalidGitRepositoryError, NoSuchPathError, GitCommandError):
+                continue
+            ts = 0.0
+            try:
+                for raw in process.proc.stdout:
+                    line = raw.decode("utf-8", errors="surrogateescape").rstrip("\n")
+                    if line.startswith("\x00"):
+                        ts = float(line[1:])
+                    elif line:
+                        path = os.path.abspath(
+                            os.path.join(repo.working_tree_dir, line)
+                        )
+                        if path in wanted:
+                            times.setdefault(path, ts)
+                            wanted.discard(path)
+                            if not wanted:
+                                break
+            finally:
+                process.proc.kill()
+                process.proc.wait()
+        for f in files:
+            key = os.path.abspath(f)
+            if key not in times:
+                try:
+                    times[key] = os.path.getmtime(f)
+                except OSError:
+                    times[key] = 0.0
+        return {f: times[os.path.abspath(f)] for f in files}
+
+    def order(self, chunks: List[Chunk]) -> List[Chunk]:
+        refs = (
+            self._reference_counts(chunks) if "most_referenced" in self.policies else {}
+        )
+        changed = (
+            self._file_change_times(chunks)
+            if "recently_changed" in self.policies
+            else {}
+        )
+
+        def key(chunk: Chunk):
+            parts = []
+            for policy in self.policies:
+                if policy == "public_api":
+                    parts.append(0 if self._is_public(chunk) else 1)
+                elif policy == "most_referenced":
+                    parts.append(-refs.get(chunk.name, 0))
+                elif policy == "recently_changed":
+                    parts.append(-changed.get(chunk.file, 0.0))
+            # stable tie-break keeps runs deterministic
+            parts.extend([chunk.file, chunk.start])
+            return tuple(parts)
+
+        return sorted(chunks, key=key)
@@ -44,6 +44,16 @@ NODE_TYPES = {
     "json": {"object", "array"},
 }
 
+# identifier-like leaves collected per chunk for the lexical index
+IDENT_TYPES = {
+    "identifier",
+    "property_identifier",
+    "type_identifier",
+    "shorthand_property_identifier",
+}
+
+CALL_TYPES = {"call", "call_expression", "new_expression"}
+
 DEFAULT_MAX_CHARS = 20000
 
 
@@ -118,6 +128,65 @@ class TreeSitterExtractor:
         # default
         return None
 
+    def _callee_name(self, node: Optional[Node], src) -> Optional[str]:
+        if node is None:
+            return None
+        if node.type in IDENT_TYPES:
+            return self._node_text(node, src)
+        # obj.method(...): python `attribute`, JS/TS `member_expression`
+        if node.type == "attribute":
+            return self._callee_name(node.child_by_field_name("attribute"), src)
+        if node.type == "member_expression":
+            return self._callee_name(node.child_by_field_name("property"), src)
+        return None
+
+    def _is_exported(self, node: Node, src) -> bool:
+        """JS/TS: declared under an `export` and not a private/protected member."""
+        for child in node.children:
+            if child.type == "accessibility_modifier" and self._node_text(
+                child, src
+            ) in ("private", "protected"):
+                return False
+            if child.type == "private_property_identifier":
+                return False
+        parent = node.parent
+        while parent is not None:
+            if parent.type == "export_statement":
+                return True
+            parent = parent.parent
+        return False
+
+    def collect_symbols(self, node: Node, src) -> Dict:
+        """
+        Identifiers referenced inside `node`, plus the names it calls: bare
+        calls (`foo()`) and member calls (`obj.foo()`) are kept apart since a
+        method name alone says little about which definition is meant.
+        """
+        identifiers = []
+        calls = set()
+        member_calls = set()
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if n.type in IDENT_TYPES:
+                identifiers.append(self._node_text(n, src))
+            elif n.type in CALL_TYPES:
+                callee = n.child_by_field_name("function") or n.child_by_field_name(
+                    "constructor"
+                )
+                name = self._callee_name(callee, src)
+                if name and callee.type in ("attribute", "member_expression"):
+                    member_calls.add(name)
+                elif name:
+                    calls.add(name)
+            stack.extend(n.children)
+        return {
+            "kind": node.type,
+            "identifiers": identifiers,
+            "calls": sorted(calls),
+            "member_calls": sorted(member_calls),
+        }
+
     def extract_from_file(
         self, file_path: str, max_chars: int = DEFAULT_MAX_CHARS
     ) -> List[Dict]:
@@ -188,8 +257,13 @@ class TreeSitterExtractor:
                             "start": start_line,
                             "end": end_line,
                             "lang": lang_name,
+                            "meta": self.collect_symbols(node, src_bytes),
                         }
                     )
+                    if lang_name != "python":
+                        results[-1]["meta"]["exported"] = self._is_exported(
+                            node, src_bytes
+                        )
             for c in reversed(node.children):
                 stack.append(c)
 
@@ -230,6 +304,7 @@ class TreeSitterExtractor:
                     start=func["start"],
                     end=func["end"],
                     lang=func["lang"],
+                    meta=func.get("meta"),
                 )
             )
 
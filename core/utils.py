@@ -1,10 +1,15 @@
 import hashlib
+from pathlib import Path
 import re
+import tempfile
 from typing import Optional
 from urllib.parse import urlparse
 import os
 
 
+IDENT_RE = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*")
+
+
 def get_repo_name(repo_url):
     """Extract repository name from URL."""
     # Remove .git extension if present
@@ -63,3 +68,35 @@ def is_all_ok(val_text: str) -> bool:
     # keep only the core token words, uppercase and remove punctuation
     core = re.sub(r"[^A-Za-z0-9_]", "", txt).upper()
     return core in ("ALLOK", "ALL_OK", "OK")
+
+
+def _current_umask() -> int:
+    # os.umask can only be read by setting it
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def atomic_write_text(path, text: str):
+    """
+    Write `text` to `path` via a temp file in the same directory and an atomic
+    rename, so readers never see a half-written file.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600; keep the target's mode, else honour the umask
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~_current_umask()
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,123 @@
+from collections import Counter, defaultdict
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from core.types import Chunk
+from core.utils import atomic_write_text
+
+
+HEADING_RE = re.compile(r"^(#{1,6})(?=\s)")
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+
+def demote_headings(md: str, levels: int = 2) -> str:
+    """Push ATX headings down `levels` (max h6), leaving fenced code alone."""
+    lines = []
+    in_fence = False
+    for line in md.splitlines():
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        elif not in_fence:
+            line = HEADING_RE.sub(
+                lambda m: "#" * min(6, len(m.group(1)) + levels), line
+            )
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class MarkdownWriter:
+    """
+    Collects chunk docs and writes one Markdown document per source file,
+    sections ordered by line. A file is written as soon as all of its expected
+    chunks are in; `flush()` writes whatever is still buffered plus the index.
+
+    Writes are atomic and skipped when the content hash matches the manifest of
+    the previous run, so unchanged outputs are never rewritten or re-read.
+    """
+
+    def __init__(
+        self, output_dir: str = "./documentations", write_index: bool = True
+    ):
+        self.output_dir = Path(output_dir)
+        self.write_index = write_index
+        self.pending: Dict[str, Dict[str, Tuple[Chunk, str]]] = defaultdict(dict)
+        self.remaining = Counter()
+        self.toc: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._made_dirs = set()
+
+        self.manifest_path = self.output_dir / ".manifest.json"
+        self.manifest = {}
+        if self.manifest_path.exists():
+            self.manifest = json.loads(self.manifest_path.read_text())
+        self.written = 0
+        self.skipped = 0
+
+    def expect(self, chunks: List[Chunk]):
+        """Register the chunks of this run so complete files can be written early."""
+        self.remaining.update(chunk.file for chunk in chunks)
+
+    @staticmethod
+    def _rel_path(chunk: Chunk) -> str:
+        return Path(os.path.relpath(chunk.file, chunk.repo)).as_posix()
+
+    def add(self, chunk: Chunk, md: str):
+        self.pending[chunk.file][chunk.id] = (chunk, md)
+        if chunk.file in self.remaining:
+            self.remaining[chunk.file] -= 1
+            if self.remaining[chunk.file] <= 0:
+                self._flush_file(chunk.file)
+
+    def _write(self, rel_out: str, text: str):
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        out_file = self.output_dir / rel_out
+        if self.manifest.get(rel_out) == digest and out_file.exists():
+            self.skipped += 1
+            return
+
+        if out_file.parent not in self._made_dirs:
+            out_file.parent.mkdir(parents=True, exist_ok=True)
+            self._made_dirs.add(out_file.parent)
+        atomic_write_text(out_file, text)
+        self.manifest[rel_out] = digest
+        self.written += 1
+
+    def _render_file(self, rel_path: str, entries: List[Tuple[Chunk, str]]) -> str:
+        sections = [
+            f"## `{chunk.name or '<anon>'}` (lines {chunk.start}-{chunk.end})"
+            + "\n\n"
+            # chunk docs carry their own #/## headings; nest them under the section
+            + demote_headings(md.strip())
+            for chunk, md in entries
+        ]
+        return f"# `{rel_path}`\n\n" + "\n\n---\n\n".join(sections) + "\n"
+
+    def _flush_file(self, file: str):
+        docs = self.pending.pop(file, None)
+        if not docs:
+            return
+        entries = sorted(docs.values(), key=lambda item: (item[0].start, item[0].end))
+        rel_path = self._rel_path(entries[0][0])
+
+        self._write(rel_path + ".md", self._render_file(rel_path, entries))
+        self.toc[rel_path] = [(c.start, c.end, c.name or "<anon>") for c, _ in entries]
+
+    def _render_index(self) -> str:
+        lines = ["# Documentation index", ""]
+        for rel_path in sorted(self.toc):
+            lines.append(f"- [`{rel_path}`]({rel_path}.md)")
+            for start, end, name in self.toc[rel_path]:
+                lines.append(f"  - `{name}` (lines {start}-{end})")
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        for file in list(self.pending):
+            self._flush_file(file)
+        if self.write_index and self.toc:
+            self._write("index.md", self._render_index())
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.manifest_path, json.dumps(self.manifest, indent=2))